@@ -1,8 +1,14 @@
 import streamlit as st
-import json
 import os
-from auth import GoogleOAuth, require_auth, get_user_role
-from config import ROLES, check_role_permission
+import time
+import importlib
+# Warm up the OAuth stack at process start: auth.py imports these lazily
+# inside its methods, so without this the first login pays the import tax
+import requests  # noqa: F401
+import jwt  # noqa: F401
+from streamlit_cookies_manager import CookieManager
+from auth import GoogleOAuth, require_auth, get_user_role, issue_session_token, verify_session_token
+from config import ROLES
 
 st.set_page_config(
     page_title="UTEM Canvas Auth",
@@ -11,151 +17,140 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def load_user_data():
-    """Load user data from JSON file"""
-    try:
-        with open('users.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+@st.cache_resource
+def get_oauth():
+    """Build the GoogleOAuth client once per process instead of per rerun"""
+    return GoogleOAuth()
+
+def set_user_role_state(email):
+    """Resolve the user's role once and precompute its permission set"""
+    role = get_user_role(email)
+    st.session_state.user_role = role
+    st.session_state.permissions = frozenset(ROLES.get(role, {}).get('permissions', ()))
+
+def ensure_token():
+    """Refresh the OAuth access token only when it is about to expire.
+
+    Call this at API boundaries; reruns that don't hit an API pay nothing.
+    """
+    token_exp = st.session_state.get('token_exp')
+    if token_exp is None or time.time() <= token_exp - 60:
+        return
+    refresh_token = st.session_state.get('refresh_token')
+    if not refresh_token:
+        return
+    tokens = get_oauth().refresh(refresh_token)
+    if tokens:
+        st.session_state.access_token = tokens.get('access_token')
+        st.session_state.token_exp = time.time() + tokens.get('expires_in', 3600)
+
+def _lazy_panel(module_name):
+    """Import a panel module only when its role actually renders it"""
+    def render():
+        importlib.import_module(f'panels.{module_name}').show()
+    return render
+
+# Dispatch table built once at module load: role -> lazy panel renderer.
+# Panel modules (and their heavy imports, e.g. pandas) are only loaded
+# for the role that uses them.
+PANEL_DISPATCH = {
+    'admin': _lazy_panel('admin'),
+    'profesor': _lazy_panel('profesor'),
+    'estudiante': _lazy_panel('estudiante')
+}
 
 def main():
     st.title("🎓 UTEM Canvas Authentication System")
-    
+
     # Initialize session state
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
     if 'user_info' not in st.session_state:
         st.session_state.user_info = None
-    
+
+    cookies = CookieManager()
+    if not cookies.ready():
+        st.stop()
+
+    # Restore the session from the signed cookie to skip the OAuth round-trip
+    if not st.session_state.authenticated:
+        token = cookies.get('auth_token')
+        if token:
+            user_info = verify_session_token(token)
+            if user_info:
+                st.session_state.authenticated = True
+                st.session_state.user_info = user_info
+                set_user_role_state(user_info['email'])
+
     # Authentication check
     if not st.session_state.authenticated:
-        st.markdown("### Acceso con Google OAuth")
-        st.info("Por favor, inicia sesión con tu cuenta de Google para acceder al sistema.")
-        
-        # OAuth login
-        oauth = GoogleOAuth()
-        if st.button("🔐 Iniciar Sesión con Google", type="primary"):
-            auth_url = oauth.get_auth_url()
-            st.write(f"[Haz clic aquí para autenticarte]({auth_url})")
-            
-        # Handle OAuth callback
+        # Handle the OAuth callback first: on callback reruns this skips
+        # rendering the login UI (and its auth-URL generation) entirely
         query_params = st.query_params
         if 'code' in query_params:
             try:
-                user_info = oauth.handle_callback(query_params['code'])
+                user_info = get_oauth().handle_callback(query_params['code'])
                 if user_info:
                     st.session_state.authenticated = True
                     st.session_state.user_info = user_info
+                    set_user_role_state(user_info['email'])
+                    st.session_state.access_token = user_info.get('access_token')
+                    st.session_state.refresh_token = user_info.get('refresh_token')
+                    st.session_state.token_exp = user_info.get('token_exp')
+                    # Sin APP_SECRET_KEY no hay token: la sesión vive solo
+                    # en session_state, sin cookie persistente
+                    token = issue_session_token(user_info)
+                    if token:
+                        cookies['auth_token'] = token
+                        cookies.save()
                     st.rerun()
             except Exception as e:
                 st.error(f"Error en autenticación: {str(e)}")
-        
+
+        st.markdown("### Acceso con Google OAuth")
+        st.info("Por favor, inicia sesión con tu cuenta de Google para acceder al sistema.")
+
+        # OAuth login
+        if st.button("🔐 Iniciar Sesión con Google", type="primary"):
+            auth_url = get_oauth().get_auth_url()
+            st.write(f"[Haz clic aquí para autenticarte]({auth_url})")
+
         return
-    
+
     # Main application for authenticated users
     user_info = st.session_state.user_info
-    user_role = get_user_role(user_info['email'])
-    
+    if 'user_role' not in st.session_state or st.session_state.user_role is None:
+        set_user_role_state(user_info['email'])
+    user_role = st.session_state.user_role
+
     # Sidebar with user info
     with st.sidebar:
-        st.markdown("### 👤 Información del Usuario")
-        st.write(f"**Nombre:** {user_info.get('name', 'N/A')}")
-        st.write(f"**Email:** {user_info.get('email', 'N/A')}")
-        st.write(f"**Rol:** {user_role}")
-        
+        st.markdown(
+            f"### 👤 Información del Usuario\n"
+            f"**Nombre:** {user_info.get('name', 'N/A')}  \n"
+            f"**Email:** {user_info.get('email', 'N/A')}  \n"
+            f"**Rol:** {user_role}"
+        )
+
         if st.button("🚪 Cerrar Sesión"):
             st.session_state.authenticated = False
             st.session_state.user_info = None
+            st.session_state.user_role = None
+            st.session_state.permissions = frozenset()
+            if 'auth_token' in cookies:
+                del cookies['auth_token']
+                cookies.save()
             st.rerun()
-    
+
     # Main content based on role
     st.markdown(f"### Bienvenido, {user_info.get('name', 'Usuario')}")
-    
+
     # Role-based navigation
-    if user_role == 'admin':
-        show_admin_panel()
-    elif user_role == 'profesor':
-        show_professor_panel()
-    elif user_role == 'estudiante':
-        show_student_panel()
+    handler = PANEL_DISPATCH.get(user_role)
+    if handler:
+        handler()
     else:
         st.warning("Rol no reconocido. Contacta al administrador.")
 
-@require_auth
-def show_admin_panel():
-    st.markdown("## 🛠️ Panel de Administrador")
-    
-    tabs = st.tabs(["Usuarios", "Configuración", "Estadísticas"])
-    
-    with tabs[0]:
-        st.subheader("Gestión de Usuarios")
-        users_data = load_user_data()
-        
-        if users_data:
-            for email, user_data in users_data.items():
-                col1, col2, col3 = st.columns([2, 1, 1])
-                with col1:
-                    st.write(f"**{user_data.get('name', 'N/A')}** ({email})")
-                with col2:
-                    st.write(f"Rol: {user_data.get('role', 'N/A')}")
-                with col3:
-                    if st.button(f"Editar", key=f"edit_{email}"):
-                        st.info("Función de edición en desarrollo")
-        else:
-            st.info("No hay usuarios registrados")
-    
-    with tabs[1]:
-        st.subheader("Configuración del Sistema")
-        st.json(ROLES)
-    
-    with tabs[2]:
-        st.subheader("Estadísticas de Uso")
-        st.info("Estadísticas en desarrollo")
-
-@require_auth
-def show_professor_panel():
-    st.markdown("## 📚 Panel de Profesor")
-    
-    if not check_role_permission(get_user_role(st.session_state.user_info['email']), 'manage_courses'):
-        st.error("No tienes permisos para acceder a esta sección")
-        return
-    
-    tabs = st.tabs(["Mis Cursos", "Calificaciones", "Recursos"])
-    
-    with tabs[0]:
-        st.subheader("Gestión de Cursos")
-        st.info("Interfaz de cursos en desarrollo")
-    
-    with tabs[1]:
-        st.subheader("Calificaciones")
-        st.info("Sistema de calificaciones en desarrollo")
-    
-    with tabs[2]:
-        st.subheader("Recursos Didácticos")
-        st.info("Biblioteca de recursos en desarrollo")
-
-@require_auth
-def show_student_panel():
-    st.markdown("## 📖 Panel de Estudiante")
-    
-    if not check_role_permission(get_user_role(st.session_state.user_info['email']), 'view_courses'):
-        st.error("No tienes permisos para acceder a esta sección")
-        return
-    
-    tabs = st.tabs(["Mis Cursos", "Tareas", "Calificaciones"])
-    
-    with tabs[0]:
-        st.subheader("Cursos Inscritos")
-        st.info("Lista de cursos en desarrollo")
-    
-    with tabs[1]:
-        st.subheader("Tareas Pendientes")
-        st.info("Sistema de tareas en desarrollo")
-    
-    with tabs[2]:
-        st.subheader("Mis Calificaciones")
-        st.info("Historial de calificaciones en desarrollo")
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
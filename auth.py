@@ -11,18 +11,153 @@ import json
 import hashlib
 import datetime
 import os
+import sqlite3
 from typing import Optional, Dict, List, Tuple
 import time
+from collections import Counter, deque
 from functools import wraps
+import atexit
 import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
-# Configurar logging
-logging.basicConfig(
-    filename='auth_logs.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+# Configurar logging: los registros se encolan y un hilo en segundo plano
+# hace la escritura a disco, para que el I/O no corra en el hilo del login
+_log_queue = queue.Queue(-1)
+_file_handler = logging.FileHandler('auth_logs.log', encoding='utf-8')
+_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(QueueHandler(_log_queue))
+
+_log_listener = QueueListener(_log_queue, _file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Cache de archivos JSON parseados, compartido entre instancias y sesiones.
+# Se invalida por mtime: el archivo sólo se relee cuando cambia en disco.
+_json_cache: Dict[str, Tuple[int, dict]] = {}
+_json_cache_lock = threading.Lock()
+
+
+def _load_json_cached(path: str) -> dict:
+    """
+    Carga un archivo JSON cacheado por (ruta, mtime)
+
+    Args:
+        path: Ruta del archivo JSON
+
+    Returns:
+        Diccionario parseado (compartido, no mutar estructuralmente fuera
+        de los métodos que también guardan el archivo)
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    with _json_cache_lock:
+        cached = _json_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    with _json_cache_lock:
+        _json_cache[path] = (mtime_ns, data)
+    return data
+
+
+def _store_json_cache(path: str, data: dict):
+    """Actualiza la entrada de cache tras guardar un archivo JSON"""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return
+    with _json_cache_lock:
+        _json_cache[path] = (mtime_ns, data)
+
+
+# CSS estático del formulario de login (constante: no se rearma por rerun)
+_LOGIN_CSS = """
+<style>
+.login-container {
+    max-width: 500px;
+    margin: auto;
+    padding: 2rem;
+    border-radius: 10px;
+    background-color: #f0f2f6;
+}
+.login-header {
+    text-align: center;
+    color: #1f4788;
+    margin-bottom: 2rem;
+}
+</style>
+"""
+
+# Valores por defecto de las variables de sesión de Streamlit
+_SESSION_DEFAULTS = (
+    ('authenticated', False),
+    ('user', None),
+    ('user_data', None),
+    ('login_time', None),
+    ('last_activity', None),
+    ('perm_set', frozenset()),
+    ('is_admin_flag', False),
+    ('facultad_display', 'N/A'),
+    ('departamento_display', 'N/A'),
 )
 
+
+class BucketRateLimiter:
+    """
+    Rate limiter de ventana deslizante con buckets por minuto
+
+    Mantiene un número fijo de buckets (Counter por minuto); el bucket
+    más antiguo se descarta al avanzar la ventana, de modo que la memoria
+    queda acotada a los emails activos dentro de la ventana y los
+    contadores expiran solos, sin timestamps de bloqueo explícitos
+    """
+
+    def __init__(self, window_minutes: int = 5, threshold: int = 5):
+        self.window_minutes = window_minutes
+        self.threshold = threshold
+        self._buckets: deque = deque()  # pares (minuto, Counter)
+        self._lock = threading.Lock()
+
+    def _advance(self, minute: int):
+        """Descarta buckets fuera de la ventana y abre el bucket actual"""
+        limit = minute - self.window_minutes
+        while self._buckets and self._buckets[0][0] <= limit:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != minute:
+            self._buckets.append((minute, Counter()))
+
+    def hit(self, email: str):
+        """Registra un intento fallido para el email"""
+        minute = int(time.time() // 60)
+        with self._lock:
+            self._advance(minute)
+            self._buckets[-1][1][email] += 1
+
+    def count(self, email: str) -> int:
+        """Intentos fallidos del email dentro de la ventana"""
+        minute = int(time.time() // 60)
+        with self._lock:
+            self._advance(minute)
+            return sum(bucket[email] for _, bucket in self._buckets)
+
+    def allowed(self, email: str) -> bool:
+        """True si el email no superó el umbral en la ventana"""
+        return self.count(email) < self.threshold
+
+    def reset(self, email: str):
+        """Limpia los intentos del email (login exitoso)"""
+        with self._lock:
+            for _, bucket in self._buckets:
+                bucket.pop(email, None)
+
+
 class AuthenticationSystem:
     """
     Sistema de autenticación principal para Dashboard UTEM
@@ -39,10 +174,14 @@ class AuthenticationSystem:
         """
         self.users_file = users_file
         self.config_file = config_file
+        # La instancia se comparte entre sesiones (st.cache_resource):
+        # las mutaciones de users_db se serializan con un RLock. Se crea
+        # antes de load_users porque save_users puede correr durante la
+        # carga inicial (creación de usuarios por defecto)
+        self._db_lock = threading.RLock()
         self.load_users()
         self.load_config()
-        self.init_session_state()
-        
+
         # Configuración OAuth (actualizar con tus credenciales)
         self.oauth_config = {
             'client_id': st.secrets.get("GOOGLE_CLIENT_ID", ""),
@@ -52,50 +191,230 @@ class AuthenticationSystem:
             'token_endpoint': "https://oauth2.googleapis.com/token",
             'scope': "openid email profile"
         }
-        
-        # Rate limiting
-        self.login_attempts = {}
+
+        # Componente OAuth construido una sola vez (la instancia es un
+        # singleton de proceso): evita releer st.secrets y reasignar el
+        # componente en cada rerun de la página de login
+        self._oauth2 = OAuth2Component(
+            client_id=self.oauth_config['client_id'],
+            client_secret=self.oauth_config['client_secret'],
+            authorize_endpoint=self.oauth_config['authorize_endpoint'],
+            token_endpoint=self.oauth_config['token_endpoint'],
+        )
+
+        # Write-behind: las mutaciones actualizan el dict en memoria y se
+        # encolan; un hilo en segundo plano las persiste en SQLite
+        self._dirty = threading.Event()
+        self._pending_lock = threading.Lock()
+        self._pending_writes = set()
+        self._pending_deletes = set()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        atexit.register(self._flush_now)
+
+        # Rate limiting (ventana deslizante, memoria acotada)
         self.max_attempts = 5
         self.lockout_duration = 300  # 5 minutos
+        self._rate_limiter = BucketRateLimiter(
+            window_minutes=self.lockout_duration // 60,
+            threshold=self.max_attempts
+        )
     
     def init_session_state(self):
-        """Inicializa las variables de sesión de Streamlit"""
-        if 'authenticated' not in st.session_state:
-            st.session_state.authenticated = False
-        if 'user' not in st.session_state:
-            st.session_state.user = None
-        if 'user_data' not in st.session_state:
-            st.session_state.user_data = None
-        if 'login_time' not in st.session_state:
-            st.session_state.login_time = None
-        if 'last_activity' not in st.session_state:
-            st.session_state.last_activity = None
+        """
+        Inicializa las variables de sesión de Streamlit
+
+        Se invoca por sesión desde create_auth_system, no en __init__:
+        la instancia es un recurso compartido entre sesiones. Un sentinel
+        reduce las llamadas repetidas a un solo test de membresía
+        """
+        if '_auth_init' in st.session_state:
+            return
+        for key, value in _SESSION_DEFAULTS:
+            st.session_state.setdefault(key, value)
+        st.session_state['_auth_init'] = True
     
     def load_users(self):
-        """Carga la base de datos de usuarios desde archivo"""
+        """
+        Carga la base de datos de usuarios desde SQLite
+
+        El almacenamiento pasó de reescribir users.json completo en cada
+        mutación a una tabla users(email PRIMARY KEY, data) con WAL:
+        las escrituras son sentencias de una fila dentro de transacción.
+        Un users.json existente se importa automáticamente la primera vez
+        """
         try:
-            if os.path.exists(self.users_file):
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    self.users_db = json.load(f)
+            db_file = self.users_file.replace('.json', '.db')
+            self._conn = sqlite3.connect(db_file, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS users (email TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self._migrate_legacy_json()
+
+            rows = self._conn.execute("SELECT email, data FROM users").fetchall()
+            if rows:
+                self.users_db = {email: json.loads(data) for email, data in rows}
             else:
-                # Crear archivo con usuarios de ejemplo
+                # Crear base con usuarios de ejemplo
                 self.create_default_users()
         except Exception as e:
             logging.error(f"Error cargando usuarios: {e}")
             self.users_db = {}
+        self._refresh_users_caches()
+
+    def _migrate_legacy_json(self):
+        """Importa users.json a SQLite si la tabla está vacía"""
+        count = self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        if count or not os.path.exists(self.users_file):
+            return
+        try:
+            legacy = _load_json_cached(self.users_file)
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO users (email, data) VALUES (?, ?)",
+                [(e, json.dumps(u, ensure_ascii=False)) for e, u in legacy.items()]
+            )
+            self._conn.execute("COMMIT")
+            logging.info(f"Usuarios migrados de {self.users_file} a SQLite")
+        except Exception as e:
+            logging.error(f"Error migrando usuarios desde JSON: {e}")
+
+    def _db_set(self, email: str, record: Dict):
+        """Inserta o actualiza un solo usuario en SQLite
+
+        default=list vuelve a serializar como lista los frozenset que la
+        capa en memoria usa para los permisos
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO users (email, data) VALUES (?, ?)",
+            (email, json.dumps(record, ensure_ascii=False, default=list))
+        )
+
+    def _db_delete(self, email: str):
+        """Elimina un solo usuario de SQLite"""
+        self._conn.execute("DELETE FROM users WHERE email = ?", (email,))
+
+    def _write_json_snapshot(self):
+        """Vuelca la base de usuarios a users.json de forma atómica
+
+        get_user_role y el panel de administración leen users.json con
+        caches por mtime; reescribir el snapshot tras cada persistencia
+        en SQLite mantiene a esos lectores al día (y su mtime cambia,
+        invalidando los caches). Misma escritura atómica que save_config:
+        temporal + fsync + os.replace
+        """
+        try:
+            tmp_file = self.users_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.users_db, f, ensure_ascii=False, default=list)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.users_file)
+        except Exception as e:
+            logging.error(f"Error escribiendo snapshot de usuarios: {e}")
+
+    def _mark_dirty(self, email: str, delete: bool = False):
+        """Encola la persistencia de una mutación (write-behind)"""
+        with self._pending_lock:
+            if delete:
+                self._pending_writes.discard(email)
+                self._pending_deletes.add(email)
+            else:
+                self._pending_deletes.discard(email)
+                self._pending_writes.add(email)
+        self._dirty.set()
+
+    def _flush_loop(self):
+        """Hilo de fondo: persiste las mutaciones pendientes cada ~5s"""
+        while True:
+            self._dirty.wait(timeout=5)
+            if self._dirty.is_set():
+                self._flush_now()
+
+    def _flush_now(self):
+        """Escribe las mutaciones pendientes en SQLite en una transacción
+
+        Las entradas pendientes solo se retiran tras un COMMIT exitoso:
+        si la escritura falla quedan encoladas y el próximo ciclo del
+        flusher la reintenta, en vez de perder la mutación.
+
+        Todo el ciclo (snapshot, escritura y resta de pendientes) ocurre
+        bajo _db_lock, que es el mismo lock que toman los mutadores: así
+        ninguna mutación puede colarse entre el COMMIT y la resta y ser
+        descartada sin persistir. El orden de adquisición (_db_lock y
+        luego _pending_lock) coincide con el de los mutadores.
+        """
+        with self._db_lock:
+            with self._pending_lock:
+                writes = set(self._pending_writes)
+                deletes = set(self._pending_deletes)
+                if not writes and not deletes:
+                    self._dirty.clear()
+                    return
+
+            try:
+                self._conn.execute("BEGIN")
+                for email in deletes:
+                    self._db_delete(email)
+                for email in writes:
+                    record = self.users_db.get(email)
+                    if record is not None:
+                        self._db_set(email, record)
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                try:
+                    self._conn.execute("ROLLBACK")
+                except Exception:
+                    pass
+                logging.error(f"Error persistiendo usuarios pendientes: {e}")
+                return
+
+            self._write_json_snapshot()
+            with self._pending_lock:
+                self._pending_writes -= writes
+                self._pending_deletes -= deletes
+                if not self._pending_writes and not self._pending_deletes:
+                    self._dirty.clear()
+
+    def _refresh_users_caches(self):
+        """Reconstruye los índices derivados de la base de usuarios"""
+        # Versión de la base: clave de invalidación para los caches
+        # por-email de st.cache_data
+        self._users_version = getattr(self, '_users_version', 0) + 1
+        # Permisos como frozenset en memoria: membership O(1) en
+        # is_authorized; en disco siguen siendo listas (ver _db_set)
+        for user in self.users_db.values():
+            permisos = user.get('permisos')
+            if permisos is not None and not isinstance(permisos, frozenset):
+                user['permisos'] = frozenset(permisos)
+        # Índice de usuarios activos: el login resuelve con un solo lookup
+        self._active_users = {e: u for e, u in self.users_db.items() if u.get('activo')}
     
     def load_config(self):
         """Carga la configuración de roles y permisos"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
+                self.config = _load_json_cached(self.config_file)
             else:
                 # Crear configuración por defecto
                 self.create_default_config()
         except Exception as e:
             logging.error(f"Error cargando configuración: {e}")
             self.config = {}
+        self._refresh_config_caches()
+
+    def _refresh_config_caches(self):
+        """Reconstruye los valores derivados de la configuración"""
+        # Tupla de sufijos para str.endswith: una sola comparación en C
+        self._allowed_domains = tuple(self.config.get('dominios_permitidos', []))
+        # Tabla rol -> nombre visible: el sidebar resuelve con un probe,
+        # sin el dict intermedio que asigna .get(role, {})
+        self._role_display = {
+            role: cfg.get('nombre', role)
+            for role, cfg in self.config.get('roles', {}).items()
+        }
     
     def create_default_users(self):
         """Crea archivo de usuarios por defecto para testing"""
@@ -195,18 +514,40 @@ class AuthenticationSystem:
         self.save_config()
     
     def save_users(self):
-        """Guarda la base de datos de usuarios en archivo"""
+        """Persiste la base de usuarios completa en SQLite (una transacción)"""
         try:
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(self.users_db, f, indent=4, ensure_ascii=False)
+            with self._db_lock:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM users")
+                self._conn.executemany(
+                    "INSERT INTO users (email, data) VALUES (?, ?)",
+                    [(e, json.dumps(u, ensure_ascii=False, default=list))
+                     for e, u in self.users_db.items()]
+                )
+                self._conn.execute("COMMIT")
+                self._write_json_snapshot()
+                self._refresh_users_caches()
         except Exception as e:
             logging.error(f"Error guardando usuarios: {e}")
     
     def save_config(self):
-        """Guarda la configuración en archivo"""
+        """Guarda la configuración en archivo (salida compacta: el archivo
+        lo lee la máquina; sin indentación se escribe ~la mitad de bytes)
+
+        La escritura es atómica: se vuelca a un archivo temporal y se
+        renombra con os.replace, de modo que un crash o una sesión
+        concurrente nunca dejan un config.json truncado, y el cache por
+        mtime se invalida con un único syscall
+        """
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            tmp_file = self.config_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.config, f, ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
+            _store_json_cache(self.config_file, self.config)
+            self._refresh_config_caches()
         except Exception as e:
             logging.error(f"Error guardando configuración: {e}")
     
@@ -217,65 +558,27 @@ class AuthenticationSystem:
         Returns:
             Tuple (permitido, mensaje)
         """
-        current_time = time.time()
-        
-        if email in self.login_attempts:
-            attempts_info = self.login_attempts[email]
-            
-            # Verificar si está en periodo de bloqueo
-            if attempts_info['locked_until'] and current_time < attempts_info['locked_until']:
-                remaining = int(attempts_info['locked_until'] - current_time)
-                return False, f"Cuenta bloqueada. Intente nuevamente en {remaining} segundos."
-            
-            # Resetear si pasó el periodo de bloqueo
-            if attempts_info['locked_until'] and current_time >= attempts_info['locked_until']:
-                self.login_attempts[email] = {
-                    'attempts': 0,
-                    'last_attempt': current_time,
-                    'locked_until': None
-                }
-        else:
-            self.login_attempts[email] = {
-                'attempts': 0,
-                'last_attempt': current_time,
-                'locked_until': None
-            }
-        
+        if not self._rate_limiter.allowed(email):
+            return False, (
+                f"Cuenta bloqueada por múltiples intentos fallidos. "
+                f"Intente nuevamente en {self._rate_limiter.window_minutes} minutos."
+            )
+
         return True, "OK"
     
     def record_login_attempt(self, email: str, success: bool):
         """Registra intento de login para rate limiting"""
-        current_time = time.time()
-        
-        if email not in self.login_attempts:
-            self.login_attempts[email] = {
-                'attempts': 0,
-                'last_attempt': current_time,
-                'locked_until': None
-            }
-        
         if not success:
-            self.login_attempts[email]['attempts'] += 1
-            self.login_attempts[email]['last_attempt'] = current_time
-            
-            # Bloquear si excede máximo de intentos
-            if self.login_attempts[email]['attempts'] >= self.max_attempts:
-                self.login_attempts[email]['locked_until'] = current_time + self.lockout_duration
+            self._rate_limiter.hit(email)
+            if not self._rate_limiter.allowed(email):
                 logging.warning(f"Cuenta bloqueada por múltiples intentos fallidos: {email}")
         else:
             # Resetear en login exitoso
-            self.login_attempts[email] = {
-                'attempts': 0,
-                'last_attempt': current_time,
-                'locked_until': None
-            }
+            self._rate_limiter.reset(email)
     
     def validate_domain(self, email: str) -> bool:
         """Valida que el email pertenezca a dominios permitidos"""
-        for domain in self.config.get('dominios_permitidos', []):
-            if email.endswith(domain):
-                return True
-        return False
+        return _validate_domain_cached(email, self._allowed_domains)
     
     def authenticate_google(self) -> Optional[Dict]:
         """
@@ -284,14 +587,7 @@ class AuthenticationSystem:
         Returns:
             Datos del usuario autenticado o None
         """
-        oauth2 = OAuth2Component(
-            client_id=self.oauth_config['client_id'],
-            client_secret=self.oauth_config['client_secret'],
-            authorize_endpoint=self.oauth_config['authorize_endpoint'],
-            token_endpoint=self.oauth_config['token_endpoint'],
-        )
-        
-        result = oauth2.authorize_button(
+        result = self._oauth2.authorize_button(
             name="Iniciar sesión con Google",
             icon="https://www.google.com/favicon.ico",
             redirect_uri=self.oauth_config['redirect_uri'],
@@ -328,26 +624,33 @@ class AuthenticationSystem:
                 logging.warning(f"Intento de login con dominio no autorizado: {email}")
                 return False, "Dominio de email no autorizado. Use su cuenta @utem.cl"
             
-            # Verificar si usuario existe en base de datos
-            if email not in self.users_db:
-                self.record_login_attempt(email, False)
-                logging.warning(f"Intento de login de usuario no registrado: {email}")
-                return False, "Usuario no registrado en el sistema. Contacte al administrador."
-            
-            user_data = self.users_db[email]
-            
-            # Verificar si usuario está activo
-            if not user_data.get('activo', False):
+            # Resolver usuario activo con un solo lookup; distinguir
+            # "no registrado" de "inactivo" sólo en la ruta de fallo
+            user_data = self._active_users.get(email)
+            if user_data is None:
                 self.record_login_attempt(email, False)
+                if email not in self.users_db:
+                    logging.warning(f"Intento de login de usuario no registrado: {email}")
+                    return False, "Usuario no registrado en el sistema. Contacte al administrador."
                 logging.warning(f"Intento de login de usuario inactivo: {email}")
                 return False, "Usuario inactivo. Contacte al administrador."
-            
+
             # Login exitoso
             st.session_state.authenticated = True
             st.session_state.user = email
             st.session_state.user_data = user_data
             st.session_state.login_time = datetime.datetime.now()
-            st.session_state.last_activity = datetime.datetime.now()
+            # Reloj monotónico para el timeout: comparación de floats sin
+            # asignar objetos datetime/timedelta en cada chequeo
+            st.session_state.last_activity = time.monotonic()
+            # Permisos memoizados para la sesión: is_authorized queda en
+            # un lookup de frozenset en vez de varios probes por chequeo
+            st.session_state.perm_set = frozenset(user_data.get('permisos', []))
+            st.session_state.is_admin_flag = user_data.get('rol') == 'admin'
+            # Strings de despliegue precalculados: .title() asigna un
+            # string nuevo en cada rerun del sidebar
+            st.session_state.facultad_display = user_data.get('facultad', 'N/A').title()
+            st.session_state.departamento_display = user_data.get('departamento', 'N/A').title()
             
             self.record_login_attempt(email, True)
             logging.info(f"Login exitoso: {email}")
@@ -368,36 +671,41 @@ class AuthenticationSystem:
         st.session_state.user_data = None
         st.session_state.login_time = None
         st.session_state.last_activity = None
-        
+        st.session_state.perm_set = frozenset()
+        st.session_state.is_admin_flag = False
+        st.session_state.facultad_display = 'N/A'
+        st.session_state.departamento_display = 'N/A'
+
         st.rerun()
     
     def check_session_timeout(self):
         """Verifica si la sesión ha expirado"""
         if st.session_state.authenticated and st.session_state.last_activity:
             timeout = self.config.get('timeout_sesion', 3600)
-            elapsed = (datetime.datetime.now() - st.session_state.last_activity).total_seconds()
-            
-            if elapsed > timeout:
+
+            if time.monotonic() - st.session_state.last_activity > timeout:
                 logging.info(f"Sesión expirada por inactividad: {st.session_state.user}")
                 self.logout()
                 return False
-            
+
             # Actualizar última actividad
-            st.session_state.last_activity = datetime.datetime.now()
-        
+            st.session_state.last_activity = time.monotonic()
+
         return True
     
     def get_user_role(self) -> Optional[str]:
         """Obtiene el rol del usuario actual"""
-        if st.session_state.authenticated and st.session_state.user_data:
-            return st.session_state.user_data.get('rol')
+        ss = st.session_state
+        if ss.authenticated and ss.user_data:
+            return ss.user_data.get('rol')
         return None
-    
-    def get_user_permissions(self) -> List[str]:
-        """Obtiene los permisos del usuario actual"""
-        if st.session_state.authenticated and st.session_state.user_data:
-            return st.session_state.user_data.get('permisos', [])
-        return []
+
+    def get_user_permissions(self) -> frozenset:
+        """Obtiene los permisos del usuario actual (frozenset compartido)"""
+        ss = st.session_state
+        if ss.authenticated and ss.user_data:
+            return ss.user_data.get('permisos', frozenset())
+        return frozenset()
     
     def is_authorized(self, permission: str) -> bool:
         """
@@ -409,35 +717,36 @@ class AuthenticationSystem:
         Returns:
             True si tiene el permiso, False en caso contrario
         """
-        if not st.session_state.authenticated:
+        ss = st.session_state
+        if not ss.authenticated:
             return False
-        
-        user_role = self.get_user_role()
-        
-        # Admin tiene todos los permisos
-        if user_role == 'admin':
-            return True
-        
-        # Verificar permisos del usuario
-        user_permissions = self.get_user_permissions()
-        return permission in user_permissions
+
+        # Admin tiene todos los permisos; el resto es un lookup O(1)
+        # sobre el frozenset memoizado en el login
+        return ss.is_admin_flag or permission in ss.perm_set
     
     def filter_data_by_role(self, data, department_column: str = 'departamento'):
         """
         Filtra datos según el rol y permisos del usuario
         
         Args:
-            data: DataFrame con los datos a filtrar
+            data: DataFrame con los datos a filtrar. Para evitar el scan
+                con .str.lower() por llamada, normalizar la columna al
+                cargar los datos:
+                df[col] = df[col].str.lower().astype('category')
             department_column: Columna que contiene el departamento
-        
+
         Returns:
             DataFrame filtrado según permisos
         """
-        if not st.session_state.authenticated:
+        import pandas as pd
+
+        ss = st.session_state
+        if not ss.authenticated:
             return None
-        
-        user_role = self.get_user_role()
-        user_data = st.session_state.user_data
+
+        user_data = ss.user_data
+        user_role = user_data.get('rol') if user_data else None
         
         # Admin ve todo
         if user_role == 'admin':
@@ -449,10 +758,17 @@ class AuthenticationSystem:
         
         # Filtrar por departamento específico
         user_dept = user_data.get('departamento')
-        if user_dept and department_column in data.columns:
-            return data[data[department_column].str.lower() == user_dept.lower()]
-        
-        return data
+        if not user_dept or department_column not in data.columns:
+            return data
+
+        user_dept_lower = user_dept.lower()
+        column = data[department_column]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Columna ya normalizada: la igualdad compara códigos enteros
+            # a nivel C, sin asignar una Series de strings nueva
+            return data[column == user_dept_lower]
+
+        return data[column.str.lower() == user_dept_lower]
     
     def login_required(self, func):
         """
@@ -465,37 +781,38 @@ class AuthenticationSystem:
         """
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if not st.session_state.authenticated:
+            # Una sola referencia a session_state: cada acceso pasa por el
+            # __getattr__ de Streamlit y este wrapper corre en cada widget
+            ss = st.session_state
+            if not ss.authenticated:
                 st.error("⚠️ Debe iniciar sesión para acceder a esta función")
                 st.stop()
-            
-            # Verificar timeout de sesión
-            if not self.check_session_timeout():
-                st.error("⚠️ Su sesión ha expirado. Por favor, inicie sesión nuevamente.")
-                st.stop()
-            
+
+            # Timeout de sesión, inline para no releer session_state
+            last_activity = ss.last_activity
+            if last_activity:
+                now = time.monotonic()
+                elapsed = now - last_activity
+                if elapsed > self.config.get('timeout_sesion', 3600):
+                    logging.info(f"Sesión expirada por inactividad: {ss.user}")
+                    self.logout()
+                    st.error("⚠️ Su sesión ha expirado. Por favor, inicie sesión nuevamente.")
+                    st.stop()
+                # Debounce: escribir last_activity como máximo cada 5s
+                if elapsed >= 5:
+                    ss.last_activity = now
+
             return func(*args, **kwargs)
         return wrapper
     
     def render_login_form(self):
         """Renderiza el formulario de login"""
-        st.markdown("""
-        <style>
-        .login-container {
-            max-width: 500px;
-            margin: auto;
-            padding: 2rem;
-            border-radius: 10px;
-            background-color: #f0f2f6;
-        }
-        .login-header {
-            text-align: center;
-            color: #1f4788;
-            margin-bottom: 2rem;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
+        # Inyectar el CSS una vez por sesión: es estático y reenviarlo en
+        # cada rerun desperdicia payload y trabajo de DOM
+        if not st.session_state.get('_login_css_injected'):
+            st.markdown(_LOGIN_CSS, unsafe_allow_html=True)
+            st.session_state['_login_css_injected'] = True
+
         col1, col2, col3 = st.columns([1, 2, 1])
         
         with col2:
@@ -540,12 +857,13 @@ class AuthenticationSystem:
     
     def render_user_sidebar(self):
         """Renderiza información del usuario en el sidebar"""
-        if st.session_state.authenticated:
+        ss = st.session_state
+        if ss.authenticated:
             with st.sidebar:
                 st.markdown("---")
                 st.markdown("### 👤 Usuario Actual")
-                
-                user_data = st.session_state.user_data
+
+                user_data = ss.user_data
                 col1, col2 = st.columns([1, 3])
                 
                 with col1:
@@ -553,15 +871,14 @@ class AuthenticationSystem:
                 
                 with col2:
                     st.markdown(f"**{user_data.get('nombre', 'Usuario')}**")
-                    st.caption(st.session_state.user)
+                    st.caption(ss.user)
                 
                 # Información del rol y permisos
                 role = user_data.get('rol', 'Sin rol')
-                role_info = self.config['roles'].get(role, {})
-                
-                st.info(f"**Rol:** {role_info.get('nombre', role)}")
-                st.caption(f"**Facultad:** {user_data.get('facultad', 'N/A').title()}")
-                st.caption(f"**Departamento:** {user_data.get('departamento', 'N/A').title()}")
+
+                st.info(f"**Rol:** {self._role_display.get(role, role)}")
+                st.caption(f"**Facultad:** {ss.facultad_display}")
+                st.caption(f"**Departamento:** {ss.departamento_display}")
                 
                 # Permisos
                 with st.expander("🔐 Permisos"):
@@ -570,8 +887,8 @@ class AuthenticationSystem:
                         st.write(f"✅ {permiso.title()}")
                 
                 # Información de sesión
-                if st.session_state.login_time:
-                    tiempo_sesion = datetime.datetime.now() - st.session_state.login_time
+                if ss.login_time:
+                    tiempo_sesion = datetime.datetime.now() - ss.login_time
                     st.caption(f"⏱️ Sesión activa: {str(tiempo_sesion).split('.')[0]}")
                 
                 # Botón de logout
@@ -591,20 +908,22 @@ class AuthenticationSystem:
             Tuple (éxito, mensaje)
         """
         try:
-            if email in self.users_db:
-                return False, "Usuario ya existe"
-            
-            # Validar dominio
-            if not self.validate_domain(email):
-                return False, "Dominio de email no válido"
-            
-            # Agregar timestamp
-            user_info['fecha_creacion'] = datetime.datetime.now().isoformat()
-            user_info['activo'] = user_info.get('activo', True)
-            
-            self.users_db[email] = user_info
-            self.save_users()
-            
+            with self._db_lock:
+                if email in self.users_db:
+                    return False, "Usuario ya existe"
+
+                # Validar dominio
+                if not self.validate_domain(email):
+                    return False, "Dominio de email no válido"
+
+                # Agregar timestamp
+                user_info['fecha_creacion'] = datetime.datetime.now().isoformat()
+                user_info['activo'] = user_info.get('activo', True)
+
+                self.users_db[email] = user_info
+                self._mark_dirty(email)
+                self._refresh_users_caches()
+
             logging.info(f"Nuevo usuario agregado: {email}")
             return True, "Usuario agregado exitosamente"
             
@@ -624,18 +943,27 @@ class AuthenticationSystem:
             Tuple (éxito, mensaje)
         """
         try:
-            if email not in self.users_db:
-                return False, "Usuario no existe"
-            
-            # Actualizar campos
-            for key, value in updates.items():
-                self.users_db[email][key] = value
-            
-            # Agregar timestamp de modificación
-            self.users_db[email]['fecha_modificacion'] = datetime.datetime.now().isoformat()
-            
-            self.save_users()
-            
+            with self._db_lock:
+                if email not in self.users_db:
+                    return False, "Usuario no existe"
+
+                # Actualizar campos
+                for key, value in updates.items():
+                    self.users_db[email][key] = value
+
+                # Agregar timestamp de modificación
+                self.users_db[email]['fecha_modificacion'] = datetime.datetime.now().isoformat()
+
+                self._mark_dirty(email)
+                self._refresh_users_caches()
+
+            # Si el usuario editado es el de la sesión actual, refrescar
+            # los permisos memoizados
+            if st.session_state.get('user') == email:
+                st.session_state.user_data = self.users_db[email]
+                st.session_state.perm_set = frozenset(self.users_db[email].get('permisos', []))
+                st.session_state.is_admin_flag = self.users_db[email].get('rol') == 'admin'
+
             logging.info(f"Usuario actualizado: {email}")
             return True, "Usuario actualizado exitosamente"
             
@@ -654,16 +982,18 @@ class AuthenticationSystem:
             Tuple (éxito, mensaje)
         """
         try:
-            if email not in self.users_db:
-                return False, "Usuario no existe"
-            
-            # No permitir eliminar al admin principal
-            if email == "admin@utem.cl":
-                return False, "No se puede eliminar al administrador principal"
-            
-            del self.users_db[email]
-            self.save_users()
-            
+            with self._db_lock:
+                if email not in self.users_db:
+                    return False, "Usuario no existe"
+
+                # No permitir eliminar al admin principal
+                if email == "admin@utem.cl":
+                    return False, "No se puede eliminar al administrador principal"
+
+                del self.users_db[email]
+                self._mark_dirty(email, delete=True)
+                self._refresh_users_caches()
+
             logging.info(f"Usuario eliminado: {email}")
             return True, "Usuario eliminado exitosamente"
             
@@ -677,14 +1007,244 @@ class AuthenticationSystem:
     
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Obtiene información de un usuario específico"""
-        return self.users_db.get(email)
+        return _get_user_cached(email, self._users_version)
+
+
+# Helpers puros por-email memoizados con st.cache_data: las mismas
+# consultas se repiten en cada rerun (el propio email del usuario se
+# verifica en cada página). La versión de la base actúa como clave de
+# invalidación tras cada mutación.
+@st.cache_data(ttl=60, max_entries=1024, show_spinner=False)
+def _validate_domain_cached(email: str, domains: tuple) -> bool:
+    if not domains:
+        return False
+    return email.endswith(domains)
+
+
+@st.cache_data(ttl=60, max_entries=1024, show_spinner=False)
+def _get_user_cached(email: str, users_version: int) -> Optional[Dict]:
+    return _get_auth().users_db.get(email)
+
+
+class GoogleOAuth:
+    """
+    Cliente OAuth de Google para el flujo de autorización de app.py
+    Construye la URL de autorización y procesa el callback con el código
+    """
+
+    def __init__(self):
+        self.client_id = st.secrets.get("GOOGLE_CLIENT_ID", "")
+        self.client_secret = st.secrets.get("GOOGLE_CLIENT_SECRET", "")
+        self.redirect_uri = st.secrets.get("REDIRECT_URI", "http://localhost:8501")
+        self.authorize_endpoint = "https://accounts.google.com/o/oauth2/v2/auth"
+        self.token_endpoint = "https://oauth2.googleapis.com/token"
+        self.userinfo_endpoint = "https://www.googleapis.com/oauth2/v2/userinfo"
+        self.scope = "openid email profile"
+
+    def get_auth_url(self) -> str:
+        """Construye la URL de autorización de Google"""
+        import urllib.parse
+        params = {
+            'client_id': self.client_id,
+            'redirect_uri': self.redirect_uri,
+            'response_type': 'code',
+            'scope': self.scope,
+            'access_type': 'offline'
+        }
+        return f"{self.authorize_endpoint}?{urllib.parse.urlencode(params)}"
+
+    def handle_callback(self, code: str) -> Optional[Dict]:
+        """
+        Intercambia el código de autorización por un token y obtiene
+        la información del usuario
+
+        Args:
+            code: Código de autorización recibido en el callback
+
+        Returns:
+            Diccionario con la información del usuario o None
+        """
+        import requests
+
+        try:
+            token_response = requests.post(self.token_endpoint, data={
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+                'code': code,
+                'grant_type': 'authorization_code',
+                'redirect_uri': self.redirect_uri
+            }, timeout=10)
+            token_response.raise_for_status()
+            tokens = token_response.json()
+
+            userinfo_response = requests.get(
+                self.userinfo_endpoint,
+                headers={'Authorization': f"Bearer {tokens['access_token']}"},
+                timeout=10
+            )
+            userinfo_response.raise_for_status()
+            user_info = userinfo_response.json()
+
+            # Adjuntar el token y su expiración para que la app pueda
+            # refrescar sólo cuando realmente expire
+            user_info['access_token'] = tokens.get('access_token')
+            user_info['refresh_token'] = tokens.get('refresh_token')
+            user_info['token_exp'] = time.time() + tokens.get('expires_in', 3600)
+            return user_info
+
+        except Exception as e:
+            logging.error(f"Error en callback OAuth: {e}")
+            return None
+
+    def refresh(self, refresh_token: str) -> Optional[Dict]:
+        """
+        Renueva el access token usando el refresh token
+
+        Args:
+            refresh_token: Refresh token emitido por Google
+
+        Returns:
+            Diccionario con el nuevo token o None
+        """
+        import requests
+
+        try:
+            response = requests.post(self.token_endpoint, data={
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+                'refresh_token': refresh_token,
+                'grant_type': 'refresh_token'
+            }, timeout=10)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logging.error(f"Error renovando token: {e}")
+            return None
+
+
+# Duración del token de sesión persistente (14 días)
+SESSION_TOKEN_LIFETIME = 14 * 24 * 3600
+
+
+def _session_secret() -> Optional[str]:
+    """
+    Obtiene la clave HS256 para firmar tokens de sesión
+
+    Si APP_SECRET_KEY no está configurada en st.secrets se devuelve None
+    y NO se emiten ni aceptan tokens: firmar con una clave vacía
+    permitiría a cualquiera fabricar una cookie de sesión válida.
+    """
+    secret = st.secrets.get("APP_SECRET_KEY", "")
+    if not secret:
+        logging.warning("APP_SECRET_KEY no configurada: sesión persistente deshabilitada")
+        return None
+    return secret
+
+
+def issue_session_token(user_info: Dict) -> str:
+    """
+    Emite un JWT firmado (HS256) con email y nombre del usuario para
+    persistir la sesión entre recargas del navegador
+
+    Args:
+        user_info: Información del usuario autenticado
+
+    Returns:
+        Token JWT firmado, o cadena vacía si no hay clave configurada
+    """
+    import jwt
+
+    secret = _session_secret()
+    if not secret:
+        return ''
+    payload = {
+        'email': user_info.get('email'),
+        'name': user_info.get('name'),
+        'exp': int(time.time()) + SESSION_TOKEN_LIFETIME
+    }
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def verify_session_token(token: str) -> Optional[Dict]:
+    """
+    Verifica un token de sesión y devuelve la información del usuario
+
+    Args:
+        token: Token JWT a verificar
+
+    Returns:
+        Diccionario con email y nombre, o None si el token no es válido
+        o no hay clave configurada
+    """
+    import jwt
+
+    secret = _session_secret()
+    if not secret:
+        return None
+    try:
+        return jwt.decode(token, secret, algorithms=["HS256"])
+    except Exception:
+        return None
+
+
+def require_auth(func):
+    """Decorador que exige sesión iniciada antes de renderizar una vista"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not st.session_state.get('authenticated'):
+            st.error("⚠️ Debe iniciar sesión para acceder a esta función")
+            st.stop()
+        return func(*args, **kwargs)
+    return wrapper
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_user_role(email: str) -> str:
+    """
+    Obtiene el rol de un usuario a partir de su email
+
+    Busca primero en users.json; si el usuario no está registrado,
+    deriva el rol por defecto según el dominio del email.
+    El resultado se cachea por email durante 5 minutos para no releer
+    users.json en cada rerun
+
+    Args:
+        email: Email del usuario
+
+    Returns:
+        Rol del usuario
+    """
+    from config import get_default_role_for_email
+
+    try:
+        with open('users.json', 'r', encoding='utf-8') as f:
+            users = json.load(f)
+        if email in users:
+            return users[email].get('role', 'invitado')
+    except Exception as e:
+        logging.error(f"Error obteniendo rol de {email}: {e}")
+
+    return get_default_role_for_email(email)
 
 
 # Funciones de utilidad para uso directo
-def create_auth_system():
-    """Crea una instancia del sistema de autenticación"""
+@st.cache_resource
+def _get_auth() -> AuthenticationSystem:
+    """Construye el sistema de autenticación una sola vez por proceso"""
     return AuthenticationSystem()
 
+
+def create_auth_system():
+    """
+    Devuelve el sistema de autenticación compartido
+
+    La instancia es un singleton cacheado entre reruns y sesiones; el
+    estado por sesión (session_state) se inicializa aquí en cada llamada
+    """
+    auth = _get_auth()
+    auth.init_session_state()
+    return auth
+
 def login_required(func):
     """Decorador para proteger páginas/funciones"""
     auth = create_auth_system()
@@ -1,6 +1,15 @@
 """
 Configuración de roles y permisos para el sistema UTEM Canvas Auth
+
+Los bucles calientes (render de sidebar, middleware de permisos) pueden
+usar directamente las constantes ROLE_NAMES y ROLE_PERMS en vez de las
+funciones validate_role / check_role_permission: la membresía inline
+sobre un frozenset evita el frame de una llamada Python por elemento.
 """
+import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
 
 # Definición de roles y sus permisos
 ROLES = {
@@ -121,21 +130,129 @@ FACULTADES = {
     }
 }
 
+# Estas estructuras son de solo lectura tras el import: se internan los
+# permisos (la comparación en membresías es por puntero), las listas
+# internas pasan a tuplas (más compactas, sin sobre-reserva) y el nivel
+# superior se congela con MappingProxyType para evitar mutaciones accidentales
+for _info in ROLES.values():
+    _info['permissions'] = tuple(sys.intern(p) for p in _info['permissions'])
+UTEM_CONFIG['supported_email_domains'] = tuple(sys.intern(d) for d in UTEM_CONFIG['supported_email_domains'])
+UTEM_CONFIG['admin_emails'] = tuple(sys.intern(e) for e in UTEM_CONFIG['admin_emails'])
+for _fac in FACULTADES.values():
+    _fac['departamentos'] = tuple(_fac['departamentos'])
+del _info, _fac
+
+ROLES = MappingProxyType(ROLES)
+UTEM_CONFIG = MappingProxyType(UTEM_CONFIG)
+FACULTADES = MappingProxyType(FACULTADES)
+
+# Permisos por rol como frozenset, construidos una vez al importar:
+# la verificación es un lookup O(1) en vez de recorrer la lista
+_ROLE_PERMISSION_SETS = {role: frozenset(info['permissions']) for role, info in ROLES.items()}
+
+# Frozenset vacío compartido para roles desconocidos (evita alocar en cada miss)
+_EMPTY = frozenset()
+
+# Tuplas de permisos por rol (las mismas ya congeladas en ROLES), para
+# llamadores que necesitan orden estable sin alocar una lista por llamada
+_ROLE_PERMISSION_TUPLES = {role: info['permissions'] for role, info in ROLES.items()}
+
+# Constantes públicas para membresía inline en bucles calientes; las
+# funciones equivalentes quedan como envoltorios de compatibilidad
+ROLE_NAMES = frozenset(ROLES)
+ROLE_PERMS = _ROLE_PERMISSION_SETS
+
+# Metadatos por rol en dicts paralelos (layout SoA): los caminos que
+# solo necesitan el nombre o la descripción leen un dict plano de cuatro
+# entradas sin pasar por el dict anidado de ROLES
+ROLE_NAME = {role: info['name'] for role, info in ROLES.items()}
+ROLE_DESC = {role: info['description'] for role, info in ROLES.items()}
+
+# Vistas de solo lectura por rol, construidas una vez: get_role_info las
+# comparte sin copia defensiva y sin riesgo de mutar la configuración
+_ROLE_INFO_VIEWS = {role: MappingProxyType(info) for role, info in ROLES.items()}
+
+# Bitmap de longitudes de nombres de rol válidos: permite rechazar
+# entradas malformadas con un len() antes de hashear el string
+_ROLE_LENGTH_MASK = 0
+for _role in ROLES:
+    _ROLE_LENGTH_MASK |= 1 << len(_role)
+del _role
+
+# Tupla de roles compartida: get_all_roles se llama en cada render y la
+# mayoría de los llamadores solo itera o hace membresía
+_ALL_ROLES = tuple(ROLES)
+
+# Índice inverso permiso -> roles que lo tienen, para responder
+# "¿qué roles pueden X?" con un lookup en vez de recorrer todos los roles
+_PERM_TO_ROLES = {}
+for _role, _info in ROLES.items():
+    for _perm in _info['permissions']:
+        _PERM_TO_ROLES.setdefault(_perm, set()).add(_role)
+_PERM_TO_ROLES = {perm: frozenset(roles) for perm, roles in _PERM_TO_ROLES.items()}
+del _role, _info, _perm
+
+# Constantes derivadas de UTEM_CONFIG: frozenset para membresía O(1) y
+# tupla para str.endswith, que acepta varias terminaciones directamente
+_ADMIN_EMAILS = frozenset(UTEM_CONFIG['admin_emails'])
+_SUPPORTED_DOMAINS = tuple(UTEM_CONFIG['supported_email_domains'])
+
+# Autómata de sufijos compilado desde los dominios soportados: clasifica
+# en una sola pasada y escala a decenas de dominios sin ramas Python
+_DOMAIN_RE = re.compile('(?:' + '|'.join(re.escape(d) for d in _SUPPORTED_DOMAINS) + ')$')
+
+# Jerarquía de roles (mayor a menor privilegio) y su nivel numérico,
+# para comparar privilegios con dos lookups en vez de recorrer la lista
+_ROLE_HIERARCHY = ('admin', 'profesor', 'estudiante', 'invitado')
+_ROLE_LEVEL = {role: level for level, role in enumerate(_ROLE_HIERARCHY)}
+
+# Cada rol como un bit y, por rol, la máscara de los roles estrictamente
+# por debajo en la jerarquía: comparar privilegios es un AND de enteros
+_ROLE_BIT = {role: 1 << level for role, level in _ROLE_LEVEL.items()}
+_STRICTLY_BELOW = {
+    role: sum(_ROLE_BIT[other] for other in _ROLE_HIERARCHY if _ROLE_LEVEL[other] > level)
+    for role, level in _ROLE_LEVEL.items()
+}
+
+# Patrón que identifica cuentas de profesor en emails UTEM: una sola
+# pasada en C sobre el string, sin el lower() intermedio
+_PROF_RE = re.compile(r'prof|docente|academico', re.IGNORECASE)
+
+# Dominios en los que existe al menos un email de administrador: permite
+# saltarse el probe al set de admins para cualquier otro dominio
+_ADMIN_DOMAINS = frozenset(email.rsplit('@', 1)[1] for email in _ADMIN_EMAILS)
+
+# Rol base por dominio del email; dominios desconocidos caen a invitado
+_DOMAIN_TO_ROLE = {
+    'utem.cl': 'estudiante',
+    'utem.ac.cl': 'estudiante',
+    'gmail.com': 'invitado'
+}
+
 def check_role_permission(role, permission):
     """
     Verifica si un rol tiene un permiso específico
-    
+
     Args:
         role (str): El rol del usuario
         permission (str): El permiso a verificar
-    
+
     Returns:
         bool: True si el rol tiene el permiso, False en caso contrario
     """
-    if role not in ROLES:
-        return False
-    
-    return permission in ROLES[role]['permissions']
+    return permission in _ROLE_PERMISSION_SETS.get(role, ())
+
+def get_roles_with_permission(permission):
+    """
+    Obtiene los roles que tienen un permiso específico
+
+    Args:
+        permission (str): El permiso a consultar
+
+    Returns:
+        frozenset: Roles que tienen el permiso (vacío si ninguno)
+    """
+    return _PERM_TO_ROLES.get(permission, _EMPTY)
 
 def get_role_info(role):
     """
@@ -145,9 +262,9 @@ def get_role_info(role):
         role (str): El rol del usuario
     
     Returns:
-        dict: Información del rol o None si no existe
+        mappingproxy: Vista de solo lectura del rol o None si no existe
     """
-    return ROLES.get(role, None)
+    return _ROLE_INFO_VIEWS.get(role, None)
 
 def get_user_permissions(role):
     """
@@ -157,10 +274,24 @@ def get_user_permissions(role):
         role (str): El rol del usuario
     
     Returns:
-        list: Lista de permisos del rol
+        frozenset: Permisos del rol (vacío si el rol no existe)
     """
-    role_info = get_role_info(role)
-    return role_info['permissions'] if role_info else []
+    return _ROLE_PERMISSION_SETS.get(role, _EMPTY)
+
+def get_user_permissions_list(role):
+    """
+    Obtiene los permisos de un rol en orden de definición
+
+    Variante secuencial de get_user_permissions para llamadores que
+    esperan orden estable (p. ej. renderizado); la tupla es compartida.
+
+    Args:
+        role (str): El rol del usuario
+
+    Returns:
+        tuple: Permisos del rol (vacía si el rol no existe)
+    """
+    return _ROLE_PERMISSION_TUPLES.get(role, ())
 
 def is_utem_email(email):
     """
@@ -172,7 +303,7 @@ def is_utem_email(email):
     Returns:
         bool: True si es email UTEM, False en caso contrario
     """
-    return any(email.endswith(domain) for domain in UTEM_CONFIG['supported_email_domains'])
+    return _DOMAIN_RE.search(email) is not None
 
 def is_admin_email(email):
     """
@@ -184,29 +315,33 @@ def is_admin_email(email):
     Returns:
         bool: True si es email de admin, False en caso contrario
     """
-    return email in UTEM_CONFIG['admin_emails']
+    return email in _ADMIN_EMAILS
 
+@lru_cache(maxsize=4096)
 def get_default_role_for_email(email):
     """
     Determina el rol por defecto basado en el email
-    
+
+    Los emails se repiten mucho dentro de una sesión, así que el
+    resultado se cachea y las llamadas repetidas son un lookup directo.
+
     Args:
         email (str): Email del usuario
-    
+
     Returns:
         str: Rol por defecto
     """
-    if is_admin_email(email):
+    # Una sola pasada: se extrae el dominio y todo se resuelve con
+    # lookups sobre él, en vez de encadenar endswith sobre el email
+    at = email.rfind('@')
+    domain = email[at + 1:] if at >= 0 else ''
+    if domain in _ADMIN_DOMAINS and email in _ADMIN_EMAILS:
         return 'admin'
-    elif email.endswith('@utem.cl'):
+    role = _DOMAIN_TO_ROLE.get(domain, 'invitado')
+    if role == 'estudiante' and _PROF_RE.search(email):
         # Lógica más sofisticada basada en patrones de email
-        if any(keyword in email.lower() for keyword in ['prof', 'docente', 'academico']):
-            return 'profesor'
-        return 'estudiante'
-    elif email.endswith('@gmail.com'):
-        return 'invitado'
-    else:
-        return 'invitado'
+        return 'profesor'
+    return role
 
 def validate_role(role):
     """
@@ -217,26 +352,31 @@ def validate_role(role):
     
     Returns:
         bool: True si el rol existe, False en caso contrario
+        (también para entradas que no son strings)
     """
-    return role in ROLES
+    return (isinstance(role, str)
+            and (_ROLE_LENGTH_MASK >> len(role)) & 1 != 0
+            and role in ROLE_NAMES)
 
 def get_all_roles():
     """
     Obtiene todos los roles disponibles
-    
+
     Returns:
-        list: Lista de todos los roles
+        tuple: Todos los roles. Es una tupla compartida: si necesitas
+        mutar el resultado, copia con list(...)
     """
-    return list(ROLES.keys())
+    return _ALL_ROLES
 
 def get_role_hierarchy():
     """
     Define la jerarquía de roles (mayor a menor privilegio)
-    
+
     Returns:
-        list: Roles ordenados por jerarquía
+        tuple: Roles ordenados por jerarquía. Es una tupla compartida:
+        si necesitas mutar el resultado, copia con list(...)
     """
-    return ['admin', 'profesor', 'estudiante', 'invitado']
+    return _ROLE_HIERARCHY
 
 def can_manage_role(manager_role, target_role):
     """
@@ -249,10 +389,35 @@ def can_manage_role(manager_role, target_role):
     Returns:
         bool: True si puede gestionar, False en caso contrario
     """
-    hierarchy = get_role_hierarchy()
-    try:
-        manager_level = hierarchy.index(manager_role)
-        target_level = hierarchy.index(target_role)
-        return manager_level < target_level  # Menor índice = mayor privilegio
-    except ValueError:
-        return False
\ No newline at end of file
+    return bool(_STRICTLY_BELOW.get(manager_role, 0) & _ROLE_BIT.get(target_role, 0))
+
+def get_roles_mask(roles):
+    """
+    Construye la máscara de bits de un conjunto de roles
+
+    Args:
+        roles (iterable): Roles a incluir en la máscara
+
+    Returns:
+        int: Máscara con un bit por rol (los desconocidos se ignoran)
+    """
+    mask = 0
+    for role in roles:
+        mask |= _ROLE_BIT.get(role, 0)
+    return mask
+
+def can_manage_all(manager_role, target_mask):
+    """
+    Verifica si un rol puede gestionar todos los roles de una máscara
+
+    Útil para filtrar en bloque (p. ej. tablas de usuarios): la
+    comprobación sobre el conjunto completo es un solo AND de enteros.
+
+    Args:
+        manager_role (str): Rol del gestor
+        target_mask (int): Máscara construida con get_roles_mask
+
+    Returns:
+        bool: True si puede gestionar todos los roles de la máscara
+    """
+    return (target_mask & ~_STRICTLY_BELOW.get(manager_role, 0)) == 0
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""
+Paneles por rol para el sistema UTEM Canvas Auth
+
+Cada panel vive en su propio módulo (admin, profesor, estudiante) y se
+importa de forma diferida desde app.py, de modo que una sesión sólo paga
+los imports del panel que realmente usa.
+"""
@@ -0,0 +1,119 @@
+import streamlit as st
+import orjson
+import math
+import os
+import pandas as pd
+from typing import NamedTuple
+from auth import require_auth
+from config import ROLES
+
+# Usuarios mostrados por página en la pestaña de gestión
+USERS_PER_PAGE = 50
+
+# ROLES is static: serialize it once at import instead of on every rerun
+# dict(ROLES): orjson no serializa el MappingProxyType con que config
+# congela la estructura
+_ROLES_JSON = orjson.dumps(dict(ROLES), option=orjson.OPT_INDENT_2).decode()
+
+class User(NamedTuple):
+    """Compact per-user record for the admin listing (flyweight)
+
+    NamedTuple en vez de dataclass: igual de compacto e inmutable, pero
+    picklable (st.cache_data guarda y sirve copias pickladas) y
+    disponible en Python 3.8
+    """
+    name: str
+    role: str
+
+# Shared role-string instances so every user with the same role points at one str
+_ROLE_INTERN = {}
+
+def _mk_user(raw):
+    role = raw.get('role', 'N/A')
+    return User(raw.get('name', 'N/A'), _ROLE_INTERN.setdefault(role, role))
+
+@st.cache_data(show_spinner=False)
+def load_user_data(mtime: float):
+    """Load user data from JSON file.
+
+    The file's mtime is passed as argument so it acts as the cache key:
+    the JSON is only re-parsed when users.json actually changes on disk.
+    Records are normalized into slotted User instances, which are a
+    fraction of the size of the raw parsed dicts.
+    """
+    with open('users.json', 'rb') as f:
+        raw = orjson.loads(f.read())
+    return {email: _mk_user(data) for email, data in raw.items()}
+
+def get_users_data():
+    """Return the cached user data, re-reading only if users.json changed"""
+    try:
+        return load_user_data(os.path.getmtime('users.json'))
+    except FileNotFoundError:
+        return {}
+
+@st.cache_data(show_spinner=False)
+def load_user_detail(email: str, mtime: float):
+    """Load the full record of a single user on demand.
+
+    The listing only keeps the hot fields (name, role); everything else
+    stays on disk until an admin actually opens a user for editing.
+    """
+    with open('users.json', 'rb') as f:
+        return orjson.loads(f.read()).get(email)
+
+def get_user_detail(email):
+    """Return the full on-disk record for one user, cached per mtime"""
+    try:
+        return load_user_detail(email, os.path.getmtime('users.json'))
+    except FileNotFoundError:
+        return None
+
+@st.fragment
+def _render_roles():
+    """Render the static ROLES config from its precomputed serialization.
+
+    As a fragment, unrelated reruns of the panel don't re-ship the block
+    to the frontend; the JSON itself is encoded once at import.
+    """
+    st.code(_ROLES_JSON, language="json")
+
+@st.fragment
+@require_auth
+def show():
+    st.markdown("## 🛠️ Panel de Administrador")
+
+    tabs = st.tabs(["Usuarios", "Configuración", "Estadísticas"])
+
+    with tabs[0]:
+        st.subheader("Gestión de Usuarios")
+        users_data = get_users_data()
+
+        if users_data:
+            total_pages = max(1, math.ceil(len(users_data) / USERS_PER_PAGE))
+            page = st.number_input("Página", min_value=1, max_value=total_pages, value=1)
+            start = (page - 1) * USERS_PER_PAGE
+            page_items = list(users_data.items())[start:start + USERS_PER_PAGE]
+
+            df = pd.DataFrame([
+                {'Email': email, 'Nombre': user.name, 'Rol': user.role}
+                for email, user in page_items
+            ])
+            st.dataframe(df, use_container_width=True, hide_index=True)
+
+            selected_email = st.selectbox("Usuario a editar", [email for email, _ in page_items])
+            if st.button("Editar"):
+                detail = get_user_detail(selected_email)
+                if detail:
+                    st.json(detail)
+                st.info("Función de edición en desarrollo")
+        else:
+            st.info("No hay usuarios registrados")
+
+    with tabs[1]:
+        st.subheader("Configuración del Sistema")
+        _render_roles()
+
+    with tabs[2]:
+        st.subheader("Estadísticas de Uso")
+        st.info("Estadísticas en desarrollo")
@@ -0,0 +1,25 @@
+import streamlit as st
+from auth import require_auth
+
+@st.fragment
+@require_auth
+def show():
+    st.markdown("## 📖 Panel de Estudiante")
+
+    if 'view_courses' not in st.session_state.permissions:
+        st.error("No tienes permisos para acceder a esta sección")
+        return
+
+    tabs = st.tabs(["Mis Cursos", "Tareas", "Calificaciones"])
+
+    with tabs[0]:
+        st.subheader("Cursos Inscritos")
+        st.info("Lista de cursos en desarrollo")
+
+    with tabs[1]:
+        st.subheader("Tareas Pendientes")
+        st.info("Sistema de tareas en desarrollo")
+
+    with tabs[2]:
+        st.subheader("Mis Calificaciones")
+        st.info("Historial de calificaciones en desarrollo")
@@ -0,0 +1,25 @@
+import streamlit as st
+from auth import require_auth
+
+@st.fragment
+@require_auth
+def show():
+    st.markdown("## 📚 Panel de Profesor")
+
+    if 'manage_courses' not in st.session_state.permissions:
+        st.error("No tienes permisos para acceder a esta sección")
+        return
+
+    tabs = st.tabs(["Mis Cursos", "Calificaciones", "Recursos"])
+
+    with tabs[0]:
+        st.subheader("Gestión de Cursos")
+        st.info("Interfaz de cursos en desarrollo")
+
+    with tabs[1]:
+        st.subheader("Calificaciones")
+        st.info("Sistema de calificaciones en desarrollo")
+
+    with tabs[2]:
+        st.subheader("Recursos Didácticos")
+        st.info("Biblioteca de recursos en desarrollo")